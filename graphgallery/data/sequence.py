@@ -1,13 +1,15 @@
 import torch
+import threading
 import numpy as np
 import scipy.sparse as sp
 import graphgallery as gg
 from graphgallery import functional as gf
 from torch.utils.data import DataLoader
 from functools import partial
+from queue import Queue, Empty, Full
 
 
-__all__ = ["Sequence", "FullBatchSequence", "NullSequence", "NodeSequence", "FastGCNBatchSequence", "NodeLabelSequence", "SAGESequence", "PyGSAGESequence", "SBVATSampleSequence", "MiniBatchSequence", "FeatureLabelSequence"]
+__all__ = ["Sequence", "FullBatchSequence", "NullSequence", "NodeSequence", "FastGCNBatchSequence", "NodeLabelSequence", "SAGESequence", "PyGSAGESequence", "SBVATSampleSequence", "MiniBatchSequence", "FeatureLabelSequence", "Prefetcher"]
 
 
 def tolist(array):
@@ -41,12 +43,24 @@ class FullBatchSequence(Sequence):
         dataset = gf.astensors(inputs, y, out_index, device=device, escape=escape)
         super().__init__([dataset], batch_size=None, collate_fn=lambda feat: feat, device=device, escape=escape, **kwargs)
 
+    def __iter__(self):
+        # the converted tensors are reused across epochs, there is
+        # no need to go through the machinery of `DataLoader`
+        if self.pin_memory:
+            return super().__iter__()
+        return iter(self.dataset)
+
 
 class NullSequence(Sequence):
 
     def __init__(self, *dataset, **kwargs):
         super().__init__([dataset], batch_size=None, collate_fn=lambda feat: feat, **kwargs)
 
+    def __iter__(self):
+        if self.pin_memory:
+            return super().__iter__()
+        return iter(self.dataset)
+
 
 class NodeSequence(Sequence):
     def __init__(self, nodes, **kwargs):
@@ -264,3 +278,90 @@ class MiniBatchSequence(Sequence):
             return inputs, y, out_index
         else:
             return inputs, y, out_index, node_ids
+
+
+class Prefetcher:
+    """Wrap a dataloader and fetch the upcoming batches in a
+    background thread, so that the CPU work of the dataloader,
+    e.g., neighbor sampling, overlaps with the computation
+    of the current batch.
+
+    Parameters
+    ----------
+    dataloader : DataLoader or any iterable
+        the dataloader to be wrapped
+    transform : Callable, optional
+        applied to each batch in the background thread,
+        e.g., moving the batch to the device, by default None
+    size : int, optional
+        the maximum number of prefetched batches, by default 2
+    """
+
+    def __init__(self, dataloader, transform=None, size=2):
+        self.dataloader = dataloader
+        self.transform = transform
+        self.size = size
+
+    def __len__(self):
+        return len(self.dataloader)
+
+    def __getattr__(self, name):
+        if name == 'dataloader':
+            raise AttributeError(name)
+        return getattr(self.dataloader, name)
+
+    def __iter__(self):
+        queue = Queue(maxsize=self.size)
+        stop = threading.Event()
+        done = object()
+        thread = threading.Thread(target=self._produce, args=(queue, stop, done), daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = queue.get()
+                if item is done:
+                    break
+                if isinstance(item, _ExceptionWrapper):
+                    raise item.exception
+                yield item
+        finally:
+            # unblock the producer if the consumer stops early
+            stop.set()
+            while thread.is_alive():
+                try:
+                    queue.get_nowait()
+                except Empty:
+                    thread.join(timeout=0.01)
+
+    def _produce(self, queue, stop, done):
+        transform = self.transform
+        try:
+            for batch in self.dataloader:
+                if transform is not None:
+                    batch = transform(batch)
+                if not self._put(queue, stop, batch):
+                    return
+        except Exception as e:
+            self._put(queue, stop, _ExceptionWrapper(e))
+        else:
+            self._put(queue, stop, done)
+
+    @staticmethod
+    def _put(queue, stop, item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.dataloader}, size={self.size})"
+
+
+class _ExceptionWrapper:
+    """Carry an exception raised in the prefetching thread."""
+
+    def __init__(self, exception):
+        self.exception = exception
@@ -7,6 +7,7 @@ import graphgallery as gg
 from graphgallery import functional as gf
 
 __all__ = ["sparse_adj_to_sparse_tensor",
+           "sparse_adj_to_sparse_csr_tensor",
            "sparse_tensor_to_sparse_adj",
            "sparse_edge_to_sparse_tensor",
            "infer_type",
@@ -16,6 +17,10 @@ __all__ = ["sparse_adj_to_sparse_tensor",
 _floatx = 'float32'
 _intx = 'int64'
 
+# the CSR layout is supported for PyTorch>=1.13, including
+# the backward pass of the sparse-dense matrix multiplication
+_CSR_SUPPORTED = tuple(int(v) for v in torch.__version__.split('.')[:2]) >= (1, 13)
+
 
 def infer_type(x: Any) -> str:
     f"""Infer the type of the input 'x'.
@@ -86,8 +91,64 @@ def sparse_adj_to_sparse_tensor(x, dtype=None):
                                         x.shape)
 
 
+def sparse_adj_to_sparse_csr_tensor(x, dtype=None):
+    """Converts a Scipy sparse matrix to a PyTorch SparseTensor
+    in CSR layout, which is typically faster than the COO layout
+    for sparse-dense matrix multiplication, e.g., `adj.mm(x)`.
+
+    It requires PyTorch>=1.13.
+
+    Parameters
+    ----------
+    x: Scipy sparse matrix
+        Matrix in Scipy sparse format.
+    dtype: string or torch.dtype, optional
+        The data type of the values, e.g., 'float32' or `torch.float32`,
+        if None, it is inferred from `x` by `infer_type`.
+
+    Returns
+    -------
+    S: SparseTensor
+        Matrix as a pytorch sparse tensor in CSR layout.
+
+    Raises
+    ------
+    RuntimeError
+        If the CSR layout is not supported by the installed PyTorch.
+    """
+    if not _CSR_SUPPORTED:
+        raise RuntimeError(f"The CSR layout requires PyTorch>=1.13, got {torch.__version__}.")
+
+    if dtype is None:
+        dtype = infer_type(x)
+
+    elif isinstance(dtype, torch.dtype):
+        dtype = str(dtype).split('.')[-1]
+
+    if not isinstance(dtype, str):
+        raise TypeError(dtype)
+
+    x = sp.csr_matrix(x)
+    if not x.has_canonical_format:
+        # sort the indices and sum the duplicate entries as the COO
+        # layout does, the copy leaves the input untouched
+        x = x.copy()
+        x.sum_duplicates()
+
+    crow_indices = torch.from_numpy(x.indptr.astype(_intx, copy=False))
+    col_indices = torch.from_numpy(x.indices.astype(_intx, copy=False))
+    values = torch.from_numpy(x.data.astype(dtype, copy=False))
+    return torch.sparse_csr_tensor(crow_indices, col_indices, values,
+                                   size=x.shape)
+
+
 def sparse_tensor_to_sparse_adj(x: torch.Tensor) -> sp.csr_matrix:
     """Converts a SparseTensor to a Scipy sparse matrix (CSR matrix)."""
+    if x.layout == getattr(torch, 'sparse_csr', None):
+        return sp.csr_matrix((x.values().detach().cpu().numpy(),
+                              x.col_indices().detach().cpu().numpy(),
+                              x.crow_indices().detach().cpu().numpy()),
+                             shape=tuple(x.size()))
     x = x.coalesce()
     data = x.values().detach().cpu().numpy()
     indices = x.indices().detach().cpu().numpy()
@@ -20,6 +20,10 @@ _TYPE = {
     'bool': torch.bool
 }
 
+# `torch.sparse_csr` is only available for PyTorch>=1.9, it is used to detect
+# CSR tensors, which are created for PyTorch>=1.13 (see `sparse_adj_to_sparse_csr_tensor`)
+_SPARSE_CSR = getattr(torch, 'sparse_csr', None)
+
 
 def data_type_dict() -> dict:
     return _TYPE
@@ -30,11 +34,11 @@ def is_tensor(x: Any) -> bool:
 
 
 def is_sparse(x: Any) -> bool:
-    return is_tensor(x) and x.is_sparse
+    return is_tensor(x) and (x.is_sparse or x.layout == _SPARSE_CSR)
 
 
 def is_dense(x: Any) -> bool:
-    return is_tensor(x) and not x.is_sparse
+    return is_tensor(x) and not is_sparse(x)
 
 
 def astensor(x, *, dtype=None, device=None, escape=None) -> torch.Tensor:
@@ -19,7 +19,9 @@
 # ==============================================================================
 
 import os
+import copy
 import time
+import string
 import torch
 import logging
 import numpy as np
@@ -86,6 +88,9 @@ class CallbackList:
         self._batch_start_time = None
         self._batch_times = []
 
+        # Performance optimization: determines if batch hooks need to be called.
+        self._update_batch_hooks()
+
     def _add_default_callbacks(self, add_history, add_progbar):
         """Adds `Callback`s that are always present."""
         self._progbar = None
@@ -107,6 +112,17 @@ class CallbackList:
 
     def append(self, callback):
         self.callbacks.append(callback)
+        self._update_batch_hooks()
+
+    def _update_batch_hooks(self):
+        """Determines which batch hooks are implemented by any of the callbacks,
+        the others are skipped since they are no-op."""
+        self._should_call_train_batch_hooks = any(
+            cb._implements_train_batch_hooks() for cb in self.callbacks)
+        self._should_call_test_batch_hooks = any(
+            cb._implements_test_batch_hooks() for cb in self.callbacks)
+        self._should_call_predict_batch_hooks = any(
+            cb._implements_predict_batch_hooks() for cb in self.callbacks)
 
     def set_params(self, params):
         self.params = params
@@ -212,10 +228,12 @@ class CallbackList:
             self.on_predict_end()
 
     def on_batch_begin(self, batch, logs=None):
-        self._call_batch_hook(ModeKeys.TRAIN, 'begin', batch, logs=logs)
+        if self._should_call_train_batch_hooks:
+            self._call_batch_hook(ModeKeys.TRAIN, 'begin', batch, logs=logs)
 
     def on_batch_end(self, batch, logs=None):
-        self._call_batch_hook(ModeKeys.TRAIN, 'end', batch, logs=logs)
+        if self._should_call_train_batch_hooks:
+            self._call_batch_hook(ModeKeys.TRAIN, 'end', batch, logs=logs)
 
     def on_epoch_begin(self, epoch, logs=None):
         """Calls the `on_epoch_begin` methods of its callbacks.
@@ -255,7 +273,8 @@ class CallbackList:
               the values of the `Model`'s metrics are returned.  Example:
               `{'loss': 0.2, 'accuracy': 0.7}`.
         """
-        self._call_batch_hook(ModeKeys.TRAIN, 'begin', batch, logs=logs)
+        if self._should_call_train_batch_hooks:
+            self._call_batch_hook(ModeKeys.TRAIN, 'begin', batch, logs=logs)
 
     def on_train_batch_end(self, batch, logs=None):
         """Calls the `on_train_batch_end` methods of its callbacks.
@@ -264,7 +283,8 @@ class CallbackList:
             batch: Integer, index of batch within the current epoch.
             logs: Dict. Aggregated metric results up until this batch.
         """
-        self._call_batch_hook(ModeKeys.TRAIN, 'end', batch, logs=logs)
+        if self._should_call_train_batch_hooks:
+            self._call_batch_hook(ModeKeys.TRAIN, 'end', batch, logs=logs)
 
     def on_test_batch_begin(self, batch, logs=None):
         """Calls the `on_test_batch_begin` methods of its callbacks.
@@ -275,7 +295,8 @@ class CallbackList:
               the values of the `Model`'s metrics are returned.  Example:
               `{'loss': 0.2, 'accuracy': 0.7}`.
         """
-        self._call_batch_hook(ModeKeys.TEST, 'begin', batch, logs=logs)
+        if self._should_call_test_batch_hooks:
+            self._call_batch_hook(ModeKeys.TEST, 'begin', batch, logs=logs)
 
     def on_test_batch_end(self, batch, logs=None):
         """Calls the `on_test_batch_end` methods of its callbacks.
@@ -284,7 +305,8 @@ class CallbackList:
             batch: Integer, index of batch within the current epoch.
             logs: Dict. Aggregated metric results up until this batch.
         """
-        self._call_batch_hook(ModeKeys.TEST, 'end', batch, logs=logs)
+        if self._should_call_test_batch_hooks:
+            self._call_batch_hook(ModeKeys.TEST, 'end', batch, logs=logs)
 
     def on_predict_batch_begin(self, batch, logs=None):
         """Calls the `on_predict_batch_begin` methods of its callbacks.
@@ -295,7 +317,8 @@ class CallbackList:
               it typically returns a dict with a key 'outputs' containing
               the model's outputs.
         """
-        self._call_batch_hook(ModeKeys.PREDICT, 'begin', batch, logs=logs)
+        if self._should_call_predict_batch_hooks:
+            self._call_batch_hook(ModeKeys.PREDICT, 'begin', batch, logs=logs)
 
     def on_predict_batch_end(self, batch, logs=None):
         """Calls the `on_predict_batch_end` methods of its callbacks.
@@ -304,7 +327,8 @@ class CallbackList:
             batch: Integer, index of batch within the current epoch.
             logs: Dict. Aggregated metric results up until this batch.
         """
-        self._call_batch_hook(ModeKeys.PREDICT, 'end', batch, logs=logs)
+        if self._should_call_predict_batch_hooks:
+            self._call_batch_hook(ModeKeys.PREDICT, 'end', batch, logs=logs)
 
     def on_train_begin(self, logs=None):
         """Calls the `on_train_begin` methods of its callbacks.
@@ -388,6 +412,12 @@ class CallbackList:
     __repr__ = __str__
 
 
+def _is_overridden(callback, hook_name):
+    """Whether the hook of `callback` differs from the no-op one of `Callback`."""
+    hook = getattr(callback, hook_name)
+    return getattr(hook, '__func__', hook) is not getattr(Callback, hook_name)
+
+
 class Callback:
     """Abstract base class used to build new callbacks.
 
@@ -432,6 +462,23 @@ class Callback:
         self.model = model
         self.model.stop_training = False
 
+    def _implements_train_batch_hooks(self):
+        """Determines if this Callback should be called for each train batch."""
+        return (_is_overridden(self, 'on_batch_begin') or
+                _is_overridden(self, 'on_batch_end') or
+                _is_overridden(self, 'on_train_batch_begin') or
+                _is_overridden(self, 'on_train_batch_end'))
+
+    def _implements_test_batch_hooks(self):
+        """Determines if this Callback should be called for each test batch."""
+        return (_is_overridden(self, 'on_test_batch_begin') or
+                _is_overridden(self, 'on_test_batch_end'))
+
+    def _implements_predict_batch_hooks(self):
+        """Determines if this Callback should be called for each predict batch."""
+        return (_is_overridden(self, 'on_predict_batch_begin') or
+                _is_overridden(self, 'on_predict_batch_end'))
+
     def on_batch_begin(self, batch, logs=None):
         """A backwards compatibility alias for `on_train_batch_begin`."""
 
@@ -689,6 +736,54 @@ class TerminateOnNaN(Callback):
                 self.model.stop_training = True
 
 
+def _has_placeholders(filepath):
+    """Returns whether `filepath` contains formatting options like `{epoch}`."""
+    return any(field is not None for _, field, _, _ in string.Formatter().parse(filepath))
+
+
+def _empty_state_dict_like(state_dict):
+    """Returns an empty `state_dict` of the same type and `_metadata`,
+    the latter is used by `load_state_dict` for versioning."""
+    new_state = type(state_dict)()
+    metadata = getattr(state_dict, '_metadata', None)
+    if metadata is not None:
+        new_state._metadata = metadata
+    return new_state
+
+
+def _clone_state_dict(state_dict):
+    """Returns a detached copy of `state_dict` on the same device,
+    the non-tensor values (e.g., from `get_extra_state`) are deep copied."""
+    snapshot = _empty_state_dict_like(state_dict)
+    for k, v in state_dict.items():
+        snapshot[k] = v.detach().clone() if torch.is_tensor(v) else copy.deepcopy(v)
+    return snapshot
+
+
+def _state_dict_to_cpu(state_dict):
+    """Returns a host copy of `state_dict` for saving.
+
+    The tensors on GPU are copied into pinned memory asynchronously
+    and each source device is synchronized once, rather than one
+    blocking copy per tensor.
+    """
+    cpu_state = _empty_state_dict_like(state_dict)
+    devices = set()
+    for k, v in state_dict.items():
+        if torch.is_tensor(v) and v.is_cuda and v.layout == torch.strided:
+            out = torch.empty(v.size(), dtype=v.dtype, pin_memory=True)
+            out.copy_(v.detach(), non_blocking=True)
+            devices.add(v.device)
+            v = out
+        cpu_state[k] = v
+
+    # the copies are queued on the streams of their source devices,
+    # which may not be the current one, e.g., `cuda:1`
+    for device in devices:
+        torch.cuda.synchronize(device)
+    return cpu_state
+
+
 class ModelCheckpoint(Callback):
     """Callback to save the Keras model or model weights at some frequency.
 
@@ -774,6 +869,13 @@ class ModelCheckpoint(Callback):
         save_weights_only: if True, then only the model's weights will be saved
           (`model.save_weights(filepath)`), else the full model is saved
           (`model.save(filepath)`).
+        autoload: if True, the saved weights are loaded into the model at the
+          end of training. Since they are not needed afterwards, the weights are
+          kept in memory rather than written to `filepath`.
+          Otherwise, if `save_best_only=True` and `save_weights_only=True`
+          and `filepath` contains no formatting options, the best weights are
+          kept in memory as well and written to `filepath` only once at the
+          end of training, rather than being overwritten on each improvement.
         **kwargs: Additional arguments for backwards compatibility.
     """
 
@@ -795,6 +897,7 @@ class ModelCheckpoint(Callback):
         self._batches_seen_since_last_saving = 0
         self._last_batch_seen = 0
         self._filepaths = []
+        self._state_dict = None
 
         if autoload and not save_weights_only:
             logging.warning('`autoload` is only work for `save_weights_only=True`, '
@@ -803,6 +906,12 @@ class ModelCheckpoint(Callback):
 
         self.save_weights_only = save_weights_only
         self.autoload = autoload
+        self._formatted = _has_placeholders(self.filepath)
+        # a fixed `filepath` would be overwritten on each improvement,
+        # so only the final (best) weights need to be written
+        self._deferred = (not autoload and save_best_only
+                          and save_weights_only
+                          and not self._formatted)
 
         if mode not in ['auto', 'min', 'max']:
             logging.warning('ModelCheckpoint mode %s is unknown, '
@@ -824,6 +933,10 @@ class ModelCheckpoint(Callback):
                 self.best = -np.Inf
 
     def on_train_begin(self, logs=None):
+        self._state_dict = None
+        if self.autoload:
+            # nothing would be written to disk
+            return
         folder = os.path.split(self.filepath)[0]
         if folder:
             folder = folder
@@ -832,11 +945,14 @@ class ModelCheckpoint(Callback):
             os.mkdir(folder)
 
     def on_train_end(self, logs=None):
-        if self.autoload and self._filepaths:
-            self.model.load_state_dict(torch.load(self._filepaths[-1]))
-            for filepath in self._filepaths:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+        if self._state_dict is None:
+            return
+        if self.autoload:
+            self.model.load_state_dict(self._state_dict)
+        else:
+            torch.save(_state_dict_to_cpu(self._state_dict), self.filepath)
+            self._filepaths.append(self.filepath)
+        self._state_dict = None
 
     def on_train_batch_end(self, batch, logs=None):
         pass
@@ -856,8 +972,7 @@ class ModelCheckpoint(Callback):
             logs: the `logs` dict passed in to `on_batch_end` or `on_epoch_end`.
         """
         logs = logs or {}
-
-        filepath = self._get_file_path(epoch, logs)
+        filepath = self.filepath
 
         try:
             if self.save_best_only:
@@ -867,28 +982,22 @@ class ModelCheckpoint(Callback):
                                     'skipping.', self.monitor)
                 else:
                     if self.monitor_op(current, self.best):
+                        filepath = self._get_file_path(epoch, logs)
                         if self.verbose > 0:
                             print('\nEpoch %05d: %s improved from %0.5f to %0.5f,'
                                   ' saving model to %s' % (epoch + 1, self.monitor,
                                                            self.best, current, filepath))
                         self.best = current
-                        if self.save_weights_only:
-                            torch.save(self.model.state_dict(), filepath)
-                        else:
-                            torch.save(self.model, filepath)
-                        self._filepaths.append(filepath)
+                        self._save(filepath)
                     else:
                         if self.verbose > 0:
                             print('\nEpoch %05d: %s did not improve from %0.5f' %
                                   (epoch + 1, self.monitor, self.best))
             else:
+                filepath = self._get_file_path(epoch, logs)
                 if self.verbose > 0:
                     print('\nEpoch %05d: saving model to %s' % (epoch + 1, filepath))
-                if self.save_weights_only:
-                    torch.save(self.model.state_dict(), filepath)
-                else:
-                    torch.save(self.model, filepath)
-                self._filepaths.append(filepath)
+                self._save(filepath)
 
         except IOError as e:
             # `e.errno` appears to be `None` so checking the content of `e.args[0]`.
@@ -899,8 +1008,23 @@ class ModelCheckpoint(Callback):
             # Re-throw the error for any other causes.
             raise e
 
+    def _save(self, filepath):
+        if self.autoload or self._deferred:
+            # the weights would be loaded (or written) at the end of training,
+            # keeping a copy in memory avoids the disk I/O during training
+            self._state_dict = _clone_state_dict(self.model.state_dict())
+            return
+
+        if self.save_weights_only:
+            torch.save(_state_dict_to_cpu(self.model.state_dict()), filepath)
+        else:
+            torch.save(self.model, filepath)
+        self._filepaths.append(filepath)
+
     def _get_file_path(self, epoch, logs):
         """Returns the file path for checkpoint."""
+        if not self._formatted:
+            return self.filepath
         try:
             # `filepath` may contain placeholders such as `{epoch:02d}` and
             # `{mape:.2f}`. A mismatch between logged metrics and the path's
@@ -1313,7 +1437,8 @@ class TqdmCallback(Callback):
     def on_epoch_end(self, epoch, logs=None):
         logs = logs or {}
         if self.verbose:
-            self.progbar.set_postfix(logs)
+            # the postfix is drawn by `update` below, no need to refresh twice
+            self.progbar.set_postfix(logs, refresh=False)
             self.progbar.update(1)
 
     def on_test_end(self, logs=None):
@@ -1,4 +1,5 @@
 import torch
+import warnings
 import graphgallery.nn.models.pytorch as models
 from graphgallery.data.sequence import FullBatchSequence
 from graphgallery import functional as gf
@@ -19,13 +20,26 @@ class GCN(NodeClasTrainer):
 
     def data_step(self,
                   adj_transform="normalize_adj",
-                  feat_transform=None):
+                  feat_transform=None,
+                  sparse_csr=False):
 
         graph = self.graph
         adj_matrix = gf.get(adj_transform)(graph.adj_matrix)
         attr_matrix = gf.get(feat_transform)(graph.attr_matrix)
 
-        feat, adj = gf.astensors(attr_matrix, adj_matrix, device=self.data_device)
+        if sparse_csr:
+            # CSR layout is faster for the sparse-dense matrix multiplication
+            # in each layer, it requires PyTorch>=1.13
+            try:
+                adj = gf.sparse_adj_to_sparse_csr_tensor(adj_matrix).to(self.data_device)
+            except RuntimeError as e:
+                warnings.warn(f"{e} Fallback to COO layout.")
+                sparse_csr = False
+
+        if sparse_csr:
+            feat = gf.astensor(attr_matrix, device=self.data_device)
+        else:
+            feat, adj = gf.astensors(attr_matrix, adj_matrix, device=self.data_device)
 
         # ``adj`` and ``feat`` are cached for later use
         self.register_cache(feat=feat, adj=adj)
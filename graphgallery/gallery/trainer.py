@@ -3,6 +3,8 @@ import inspect
 import warnings
 import torch
 
+from contextlib import nullcontext
+
 from torch import Tensor
 from typing import Optional, Union, Any, Callable, List
 
@@ -12,6 +14,16 @@ from torch.utils.data import DataLoader, Dataset
 import graphgallery as gg
 from graphgallery import functional as gf
 from graphgallery.utils import Progbar
+from graphgallery.data.sequence import Prefetcher
+
+
+def _has_multiple_batches(dataloader) -> bool:
+    """Whether `dataloader` yields more than one batch, which is assumed
+    if its length is unknown, e.g., an iterable dataset."""
+    try:
+        return len(dataloader) > 1
+    except TypeError:
+        return True
 
 
 def format_doc(d):
@@ -69,6 +81,8 @@ class Trainer:
         self.name = name or self.__class__.__name__
 
         self._model = None
+        self._forward = None
+        self._amp_dtype = None
         self._graph = None
         self._cache = gf.BunchDict()
         self.transform = gf.BunchDict()
@@ -150,8 +164,9 @@ class Trainer:
                 "Please call 'trainer.setup_graph(graph)' first.")
 
         model, kwargs = gf.wrapper(self.model_step)(**kwargs)
-        self._model = model.to(self.device)
+        self.model = model.to(self.device)
 
+        self._amp_dtype = self.config_amp_dtype()
         self.optimizer = self.config_optimizer()
         self.scheduler = self.config_scheduler(self.optimizer)
         self.loss = self.config_loss()
@@ -167,7 +182,29 @@ class Trainer:
         """Implement you model building function here"""
         raise NotImplementedError
 
-    def fit(self, train_data, val_data=None, epochs=100, callbacks=None, verbose=None):
+    def fit(self, train_data, val_data=None, epochs=100, callbacks=None, verbose=None, prefetch=False):
+        """Train the model on `train_data` for `epochs` epochs.
+
+        Parameters
+        ----------
+        train_data : DataLoader, Dataset or the inputs of `config_train_data`
+            the training data, e.g., the index of training nodes
+        val_data : DataLoader, Dataset or the inputs of `config_test_data`, optional
+            the validation data, by default None
+        epochs : int, optional
+            the number of training epochs, by default 100
+        callbacks : a list of Callback, optional
+            the callbacks used in training, by default None
+        verbose : int, optional
+            the verbosity mode, by default None
+        prefetch : bool, optional
+            whether to fetch the upcoming batches (and put them into `self.device`)
+            in a background thread while computing the current one,
+            it is useful for mini-batch models with heavy sampling, by default False.
+            Note that the sampling then runs in another thread and shares the
+            global random states of torch/numpy with the main thread (e.g., dropout),
+            so the runs are no longer reproducible with `seed`.
+        """
 
         model = self.model
 
@@ -191,6 +228,13 @@ class Trainer:
             if not isinstance(val_data, (DataLoader, Dataset)):
                 val_data = self.config_test_data(val_data)
 
+        if prefetch:
+            # full-batch dataloaders have nothing to overlap with
+            if _has_multiple_batches(train_data):
+                train_data = Prefetcher(train_data, transform=self.to_device)
+            if validation and _has_multiple_batches(val_data):
+                val_data = Prefetcher(val_data, transform=self.to_device)
+
         # Setup callbacks
         self.callbacks = callbacks = self.config_callbacks(
             verbose, epochs, callbacks=callbacks)
@@ -201,18 +245,24 @@ class Trainer:
         if verbose:
             print("Training...")
 
+        # bind the per-epoch methods once rather than inside the loop
+        train_step = self.train_step
+        test_step = self.test_step
+        to_items = self.to_items
+
         callbacks.on_train_begin()
         try:
             for epoch in range(epochs):
                 callbacks.on_epoch_begin(epoch)
-                train_logs = self.train_step(train_data)
-                logs.update({k: self.to_item(v)
-                            for k, v in train_logs.items()})
+                epoch_logs = train_step(train_data)
 
                 if validation:
-                    valid_logs = self.test_step(val_data)
-                    logs.update({("val_" + k): self.to_item(v)
-                                for k, v in valid_logs.items()})
+                    valid_logs = test_step(val_data)
+                    epoch_logs.update({("val_" + k): v
+                                       for k, v in valid_logs.items()})
+
+                # the results of training and validation are moved to host at once
+                logs.update(to_items(epoch_logs))
 
                 callbacks.on_epoch_end(epoch, logs)
 
@@ -238,35 +288,65 @@ class Trainer:
         dict
             the output logs, including `loss` and `val_accuracy`, etc.
         """
-        loss_fn = self.loss
         model = self.model
+        callbacks = self.callbacks
+        train_step_on_batch = self.train_step_on_batch
+        unravel_batch = self.unravel_batch
 
         self.reset_metrics()
         model.train()
 
         for epoch, batch in enumerate(dataloader):
-            self.callbacks.on_train_batch_begin(epoch)
-            x, y, out_index = self.unravel_batch(batch)
-            x = self.to_device(x)
-            y = self.to_device(y)
-
-            if not isinstance(x, tuple):
-                x = x,
-            out = model(*x)
-
-            if out_index is not None:
-                out = out[out_index]
-            loss = loss_fn(out, y)
-            loss.backward()
-            for metric in self.metrics:
-                metric.update_state(y.cpu(), out.detach().cpu())
-            self.callbacks.on_train_batch_end(epoch)
+            callbacks.on_train_batch_begin(epoch)
+            x, y, out_index = unravel_batch(batch)
+            loss = train_step_on_batch(x, y, out_index)
+            callbacks.on_train_batch_end(epoch)
 
         metrics = [metric.result() for metric in self.metrics]
-        results = [loss.cpu().item()] + metrics
+        results = [loss.detach()] + metrics
 
         return dict(zip(self.metrics_names, results))
 
+    def train_step_on_batch(self, x, y, out_index=None) -> Tensor:
+        """Forward and backward pass on a single training batch.
+
+        Parameters
+        ----------
+        x : Tensor or a tuple of Tensors
+            the inputs of the model
+        y : Tensor
+            the labels of the inputs
+        out_index : Tensor, optional
+            the index of the outputs that used to compute the loss,
+            by default None
+
+        Returns
+        -------
+        Tensor
+            the training loss of the batch
+        """
+        x = self.to_device(x)
+        y = self.to_device(y)
+
+        if not isinstance(x, tuple):
+            x = x,
+
+        with self.autocast():
+            out = self._forward(*x)
+            if out_index is not None:
+                out = out[out_index]
+            loss = self.loss(out, y)
+
+        loss.backward()
+        if self._amp_dtype is not None:
+            # metrics (e.g., the ones using sklearn) may not accept low precision
+            out = out.float()
+        # metrics are updated on device, and only computed at the end of
+        # each epoch, which avoids a device-to-host sync for every batch
+        for metric in self.metrics:
+            metric.update_state(y, out.detach())
+        return loss
+
     def evaluate(self, test_data, verbose=1):
 
         if not self.model:
@@ -282,39 +362,47 @@ class Trainer:
 
         progbar = Progbar(target=len(test_data),
                           verbose=verbose)
-        logs = gf.BunchDict(**self.test_step(test_data))
-        logs.update({k: self.to_item(v) for k, v in logs.items()})
+        logs = gf.BunchDict(self.to_items(self.test_step(test_data)))
         progbar.update(len(test_data), logs)
         return logs
 
     @torch.no_grad()
     def test_step(self, dataloader: DataLoader) -> dict:
-        loss_fn = self.loss
         model = self.model
         model.eval()
         callbacks = self.callbacks
+        test_step_on_batch = self.test_step_on_batch
+        unravel_batch = self.unravel_batch
         self.reset_metrics()
 
         for epoch, batch in enumerate(dataloader):
             callbacks.on_test_batch_begin(epoch)
-            x, y, out_index = self.unravel_batch(batch)
-            x = self.to_device(x)
-            y = self.to_device(y)
-            if not isinstance(x, tuple):
-                x = x,
-            out = model(*x)
-            if out_index is not None:
-                out = out[out_index]
-            loss = loss_fn(out, y)
-            for metric in self.metrics:
-                metric.update_state(y.cpu(), out.detach().cpu())
+            x, y, out_index = unravel_batch(batch)
+            loss = test_step_on_batch(x, y, out_index)
             callbacks.on_test_batch_end(epoch)
 
         metrics = [metric.result() for metric in self.metrics]
-        results = [loss.cpu().item()] + metrics
+        results = [loss.detach()] + metrics
 
         return dict(zip(self.metrics_names, results))
 
+    def test_step_on_batch(self, x, y, out_index=None) -> Tensor:
+        """Forward pass on a single testing batch, see `train_step_on_batch`."""
+        x = self.to_device(x)
+        y = self.to_device(y)
+        if not isinstance(x, tuple):
+            x = x,
+        with self.autocast():
+            out = self._forward(*x)
+            if out_index is not None:
+                out = out[out_index]
+            loss = self.loss(out, y)
+        if self._amp_dtype is not None:
+            out = out.float()
+        for metric in self.metrics:
+            metric.update_state(y, out.detach())
+        return loss
+
     def predict(self, predict_data=None,
                 transform: Callable = torch.nn.Softmax(dim=-1)):
 
@@ -337,10 +425,12 @@ class Trainer:
         model.eval()
         outs = []
         callbacks = self.callbacks
+        unravel_batch = self.unravel_batch
+        to_device = self.to_device
         for epoch, batch in enumerate(dataloader):
             callbacks.on_predict_batch_begin(epoch)
-            x, y, out_index = self.unravel_batch(batch)
-            x = self.to_device(x)
+            x, y, out_index = unravel_batch(batch)
+            x = to_device(x)
             if not isinstance(x, tuple):
                 x = x,
             out = model(*x)
@@ -363,6 +453,42 @@ class Trainer:
     def config_metrics(self) -> Callable:
         raise NotImplementedError
 
+    def config_amp_dtype(self) -> Optional[torch.dtype]:
+        """Returns the dtype of automatic mixed precision from the config
+        `amp_dtype`, or None (full precision) if it is not specified or
+        not supported, see `autocast`."""
+        amp_dtype = self.cfg.get('amp_dtype', None)
+        if amp_dtype is None:
+            return None
+        if isinstance(amp_dtype, str):
+            amp_dtype = getattr(torch, amp_dtype)
+
+        if self._overrides_steps():
+            warnings.warn(f"Mixed precision is not supported by {self.name} since it overrides "
+                          "`train_step` or `test_step`, fallback to full precision.")
+            return None
+
+        if not hasattr(torch, 'autocast'):
+            warnings.warn("Mixed precision requires PyTorch>=1.10, "
+                          "fallback to full precision.")
+            return None
+
+        try:
+            # unsupported pairs of device and dtype either raise
+            # or warn and disable autocast, depending on the releases
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                torch.autocast(device_type=self.device.type, dtype=amp_dtype)
+        except Exception as e:
+            warnings.warn(f"Mixed precision with `{amp_dtype}` is not supported on {self.device}: {e}, "
+                          "fallback to full precision.")
+            return None
+
+        if amp_dtype == torch.float16:
+            warnings.warn("Mixed precision with `float16` is used without loss scaling, "
+                          "the gradients may underflow, consider `bfloat16` instead.")
+        return amp_dtype
+
     def config_callbacks(self, verbose, epochs, callbacks=None) -> CallbackList:
         callbacks = CallbackList(
             callbacks=callbacks, add_history=True, add_progbar=True if verbose else False)
@@ -445,7 +571,10 @@ class Trainer:
         if value is None:
             return value
 
-        elif hasattr(value, 'numpy'):
+        elif torch.is_tensor(value):
+            value = value.detach().cpu()
+
+        if hasattr(value, 'numpy'):
             value = value.numpy()
 
         if hasattr(value, 'item'):
@@ -453,6 +582,46 @@ class Trainer:
 
         return value
 
+    @classmethod
+    def to_items(cls, logs: dict) -> dict:
+        """Transform the values of `logs` to Python objects,
+        the scalar tensors among them are gathered and moved to host
+        with a single device-to-host copy for each dtype, instead of one for each.
+
+        Parameters
+        ----------
+        logs : dict
+            the logs with values of Tensor, Numpy array or Python object
+
+        Returns
+        -------
+        dict
+            the logs with values of Python object
+
+        Example
+        -------
+        >>> logs = dict(loss=torch.tensor(0.5), accuracy=torch.tensor(1.))
+        >>> to_items(logs)
+        {'loss': 0.5, 'accuracy': 1.0}
+        """
+        # the scalars are grouped by device and dtype, and each group is stacked
+        # in its native dtype, e.g., `float64` is not supported on MPS
+        groups = {}
+        for k, v in logs.items():
+            if torch.is_tensor(v) and v.numel() == 1:
+                groups.setdefault((v.device, v.dtype), []).append(k)
+
+        items = {}
+        for keys in groups.values():
+            if len(keys) == 1:
+                items[keys[0]] = cls.to_item(logs[keys[0]])
+            else:
+                values = torch.stack([logs[k].detach().reshape(()) for k in keys]).tolist()
+                items.update(zip(keys, values))
+
+        return {k: items[k] if k in items else cls.to_item(v)
+                for k, v in logs.items()}
+
     def to_device(self, x: Any) -> Any:
         """Put `x` into the device `self.device`.
 
@@ -465,11 +634,21 @@ class Trainer:
         -------
         x : any object, probably `torch.Tensor`.
             the input variable that in the device `self.device`.
+
+        Note
+        ----
+        Host-to-device copies are issued with `non_blocking=True`,
+        they overlap with computation if the host tensors are pinned,
+        e.g., using a dataloader with `pin_memory=True`.
         """
         device = self.device
+        # device-to-host copies are not safe to be asynchronous
+        non_blocking = device.type == 'cuda'
 
         def wrapper(inputs):
-            if isinstance(inputs, tuple):
+            if torch.is_tensor(inputs):
+                return inputs.to(device, non_blocking=non_blocking)
+            elif isinstance(inputs, tuple):
                 return tuple(wrapper(input) for input in inputs)
             elif isinstance(inputs, dict):
                 for k, v in inputs.items():
@@ -522,6 +701,59 @@ class Trainer:
     def model(self, m):
         assert m is None or isinstance(m, torch.nn.Module)
         self._model = m
+        self._forward = self.compile_model(m) if m is not None else None
+
+    def autocast(self):
+        """Returns the context manager of automatic mixed precision used
+        in the forward pass of training and testing.
+
+        It is enabled by the config `amp_dtype`, e.g., `Trainer(amp_dtype='bfloat16')`,
+        which halves the memory traffic of the features and activates
+        tensor cores for the linear layers on Ampere or newer GPUs.
+        Note that a sparse adjacency matrix is also cast by autocast at each
+        forward pass.
+
+        It is only honoured by the trainers using the default `train_step`
+        and `test_step` (e.g., GCN and SGC), the others (e.g., RobustGCN and
+        the link prediction trainers) warn and fallback to full precision.
+        """
+        if self._amp_dtype is None:
+            return nullcontext()
+        return torch.autocast(device_type=self.device.type, dtype=self._amp_dtype)
+
+    def compile_model(self, model: torch.nn.Module) -> Callable:
+        """Returns the forward function of `model` used in training and testing.
+
+        If the config `compile=True` is specified, e.g., `Trainer(compile=True)`,
+        the model is compiled using `torch.compile` (PyTorch>=2.0) to fuse the
+        kernels and reduce the Python overhead. Dynamic shapes are enabled since
+        the sizes of sampled subgraphs may vary from batch to batch.
+
+        Like `autocast`, it is only honoured by the trainers using the default
+        `train_step` and `test_step`, the others warn and fallback to eager mode.
+        """
+        if not self.cfg.get('compile', False):
+            return model
+
+        if self._overrides_steps():
+            warnings.warn(f"`compile` is not supported by {self.name} since it overrides "
+                          "`train_step` or `test_step`, fallback to eager mode.")
+            return model
+
+        if not hasattr(torch, 'compile'):
+            warnings.warn("`torch.compile` requires PyTorch>=2.0, "
+                          "fallback to eager mode.")
+            return model
+
+        return torch.compile(model, dynamic=True)
+
+    def _overrides_steps(self) -> bool:
+        """Whether `train_step` or `test_step` is overridden, the overridden ones
+        call the model directly rather than `train_step_on_batch`
+        and `test_step_on_batch`."""
+        cls = type(self)
+        return (cls.train_step is not Trainer.train_step
+                or cls.test_step is not Trainer.test_step)
 
     def reset_metrics(self):
         if self.metrics is None:
@@ -54,7 +54,8 @@ class Accuracy(Metric):
             y_pred = y_pred[sample_weight]
             y_true = y_true[sample_weight]
 
-        self.correct += torch.sum(y_pred == y_true)
+        # out-of-place, so that the states follow the device of the inputs
+        self.correct = self.correct + torch.sum(y_pred == y_true)
         self.total += y_true.numel()
 
     def reset_states(self):
@@ -90,6 +90,18 @@ class Progbar:
                 finalize = False
             else:
                 finalize = current >= self.target
+
+        self._seen_so_far = current
+        now = time.perf_counter()
+
+        # skip building the message if nothing would be displayed
+        if not finalize:
+            if self.verbose == 1 and now - self._last_update < self.interval:
+                return
+            if self.verbose == 2:
+                self._last_update = now
+                return
+
         msg = msg or {}
 
         if isinstance(msg, str):
@@ -113,9 +125,6 @@ class Progbar:
 
         message = message.strip()
 
-        self._seen_so_far = current
-
-        now = time.perf_counter()
         delta = now - self._start
 
         if delta >= 1:
@@ -126,8 +135,6 @@ class Progbar:
             delta = ' %.2fus' % (delta * 1e6)
         info = ' - Total:%s' % delta
         if self.verbose == 1:
-            if now - self._last_update < self.interval and not finalize:
-                return
             info += ' -'
             prev_total_width = self._total_width
             if self._dynamic_display:
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from graphgallery.data.sequence import Prefetcher
+
+
+class Loader:
+    """A minimal dataloader-like iterable."""
+
+    def __init__(self, num_batches, fail_at=None):
+        self.num_batches = num_batches
+        self.fail_at = fail_at
+        self.batch_size = 4
+
+    def __len__(self):
+        return self.num_batches
+
+    def __iter__(self):
+        for i in range(self.num_batches):
+            if i == self.fail_at:
+                raise ValueError(f"failed at batch {i}")
+            yield i
+
+
+def test_prefetcher_order_and_count():
+    loader = Loader(10)
+    assert list(Prefetcher(loader)) == list(loader)
+    assert list(Prefetcher(loader, size=1)) == list(range(10))
+    # iterating again starts from scratch
+    prefetcher = Prefetcher(loader)
+    assert list(prefetcher) == list(prefetcher)
+
+
+def test_prefetcher_transform():
+    assert list(Prefetcher(Loader(5), transform=lambda x: x * 2)) == [0, 2, 4, 6, 8]
+
+
+def test_prefetcher_reraises_exception():
+    batches = []
+    with pytest.raises(ValueError, match="failed at batch 3"):
+        for batch in Prefetcher(Loader(10, fail_at=3)):
+            batches.append(batch)
+    assert batches == [0, 1, 2]
+
+
+def test_prefetcher_early_break():
+    num_threads = threading.active_count()
+    it = iter(Prefetcher(Loader(100), size=1))
+    assert next(it) == 0
+    assert threading.active_count() == num_threads + 1
+    it.close()
+    assert threading.active_count() == num_threads
+
+
+def test_prefetcher_len_and_getattr():
+    loader = Loader(7)
+    prefetcher = Prefetcher(loader)
+    assert len(prefetcher) == 7
+    assert prefetcher.batch_size == 4
+    assert prefetcher.dataloader is loader
+    with pytest.raises(AttributeError):
+        prefetcher.not_an_attribute
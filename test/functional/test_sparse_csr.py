@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import torch
+
+from graphgallery import functional as gf
+from graphgallery.functional.tensor.ops import _CSR_SUPPORTED
+
+pytestmark = pytest.mark.skipif(not _CSR_SUPPORTED,
+                                reason="CSR layout requires PyTorch>=1.13")
+
+
+def test_sparse_csr_round_trip():
+    adj = sp.random(10, 10, density=0.3, format='csr', random_state=42, dtype=np.float32)
+    x = gf.sparse_adj_to_sparse_csr_tensor(adj)
+    assert x.layout == torch.sparse_csr
+    assert x.dtype == torch.float32
+
+    out = gf.tensoras(x)
+    assert sp.isspmatrix_csr(out)
+    assert out.shape == adj.shape
+    assert (out != adj).nnz == 0
+
+
+def test_sparse_csr_unsorted_and_duplicate_indices():
+    # row 0 has unsorted column indices, row 1 has a duplicate entry
+    indptr = np.array([0, 2, 4])
+    indices = np.array([2, 0, 1, 1])
+    data = np.array([1., 2., 3., 4.], dtype=np.float32)
+    adj = sp.csr_matrix((data, indices, indptr), shape=(2, 3))
+    expected = adj.toarray()
+
+    x = gf.sparse_adj_to_sparse_csr_tensor(adj)
+    assert x.values().numel() == 3
+    np.testing.assert_array_equal(x.to_dense().numpy(), expected)
+
+    out = gf.tensoras(x)
+    assert out.has_canonical_format
+    assert (out != sp.csr_matrix(expected)).nnz == 0
+    # the input is left untouched
+    np.testing.assert_array_equal(adj.indices, indices)
+
+
+def test_sparse_csr_is_sparse():
+    x = gf.sparse_adj_to_sparse_csr_tensor(sp.eye(3, format='csr'))
+    assert gf.is_sparse(x)
+    assert not gf.is_dense(x)
+    assert gf.is_dense(x.to_dense())
+    assert not gf.is_sparse(x.to_dense())
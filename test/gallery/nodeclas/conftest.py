@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from graphgallery.data import Graph
+
+
+@pytest.fixture
+def toy_graph():
+    """A small ring graph with random features and two classes."""
+    num_nodes, num_feats = 20, 8
+    rng = np.random.RandomState(42)
+    row = np.arange(num_nodes)
+    col = (row + 1) % num_nodes
+    adj_matrix = sp.csr_matrix((np.ones(num_nodes, dtype=np.float32), (row, col)),
+                               shape=(num_nodes, num_nodes))
+    adj_matrix = adj_matrix + adj_matrix.T
+    attr_matrix = rng.rand(num_nodes, num_feats).astype(np.float32)
+    label = np.arange(num_nodes) % 2
+    return Graph(adj_matrix, attr_matrix, label)
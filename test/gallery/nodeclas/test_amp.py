@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+import torch
+
+from graphgallery.gallery.nodeclas.pytorch import GCN, RobustGCN
+
+pytestmark = pytest.mark.skipif(not hasattr(torch, 'autocast'),
+                                reason="`torch.autocast` requires PyTorch>=1.10")
+
+
+def test_gcn_fit_bfloat16(toy_graph):
+    trainer = GCN(device='cpu', seed=42, amp_dtype='bfloat16')
+    trainer.setup_graph(toy_graph)
+    trainer.build()
+    assert trainer._amp_dtype is torch.bfloat16
+
+    trainer.fit(np.arange(10), np.arange(10, 20), epochs=2, verbose=0)
+    history = trainer.model.history.history
+    assert len(history['loss']) == len(history['val_loss']) == 2
+    assert np.isfinite(history['loss']).all()
+    assert np.isfinite(history['val_loss']).all()
+
+    # the parameters are kept in full precision
+    assert all(p.dtype == torch.float32 for p in trainer.model.parameters())
+
+
+def test_amp_fallback_for_overridden_steps(toy_graph):
+    trainer = RobustGCN(device='cpu', seed=42, amp_dtype='bfloat16')
+    trainer.setup_graph(toy_graph)
+    with pytest.warns(UserWarning, match="Mixed precision is not supported"):
+        trainer.build()
+    assert trainer._amp_dtype is None
+
+
+def test_amp_fallback_for_unsupported_dtype(toy_graph):
+    trainer = GCN(device='cpu', seed=42, amp_dtype='float64')
+    trainer.setup_graph(toy_graph)
+    with pytest.warns(UserWarning, match="is not supported on cpu"):
+        trainer.build()
+    assert trainer._amp_dtype is None
+    trainer.fit(np.arange(10), epochs=1, verbose=0)
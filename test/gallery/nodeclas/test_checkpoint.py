@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+
+from graphgallery.gallery.callbacks import Callback, ModelCheckpoint
+from graphgallery.gallery.nodeclas.pytorch import GCN
+
+
+class Interrupt(Callback):
+    def __init__(self, epoch):
+        super().__init__()
+        self.epoch = epoch
+
+    def on_epoch_end(self, epoch, logs=None):
+        if epoch == self.epoch:
+            raise KeyboardInterrupt
+
+
+def test_deferred_checkpoint_written_when_training_raises(toy_graph, tmp_path):
+    filepath = str(tmp_path / 'ckpt' / 'weights')
+    trainer = GCN(device='cpu', seed=42)
+    trainer.setup_graph(toy_graph)
+    trainer.build()
+
+    callbacks = [ModelCheckpoint(filepath, monitor='val_loss', autoload=False),
+                 Interrupt(epoch=2)]
+    with pytest.raises(KeyboardInterrupt):
+        trainer.fit(np.arange(10), np.arange(10, 20), epochs=10,
+                    callbacks=callbacks, verbose=0)
+
+    assert os.path.exists(filepath + '.pth')
+    trainer.model.load_state_dict(torch.load(filepath + '.pth'))
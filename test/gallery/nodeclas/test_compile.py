@@ -0,0 +1,11 @@
+import pytest
+
+from graphgallery.gallery.nodeclas.pytorch import RobustGCN
+
+
+def test_compile_fallback_for_overridden_steps(toy_graph):
+    trainer = RobustGCN(device='cpu', seed=42, compile=True)
+    trainer.setup_graph(toy_graph)
+    with pytest.warns(UserWarning, match="`compile` is not supported"):
+        trainer.build()
+    assert trainer._forward is trainer.model
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import torch
+
+from graphgallery.gallery.nodeclas.pytorch import GCN
+
+
+def test_predict_returns_normal_tensors(toy_graph):
+    trainer = GCN(device='cpu', seed=42)
+    trainer.setup_graph(toy_graph)
+    trainer.build()
+    trainer.fit(np.arange(10), epochs=1, verbose=0)
+
+    logits = trainer.predict(np.arange(10, 20), transform=None)
+    assert logits.shape == (10, toy_graph.num_classes)
+    if hasattr(logits, 'is_inference'):
+        assert not logits.is_inference()
+
+    # in-place modification and autograd are allowed on the outputs
+    logits[0] = 0.
+    weight = torch.ones(1, requires_grad=True)
+    (logits * weight).sum().backward()
+    assert weight.grad is not None
+
+
+def test_predict_before_fit_with_cached_layers(toy_graph):
+    # `SGConv(cached=True)` caches the propagated features in the first
+    # forward pass, here it is filled by `predict` and reused by `fit`
+    pytest.importorskip('torch_geometric')
+    import graphgallery as gg
+
+    backend = gg.backend()
+    gg.set_backend('pyg')
+    try:
+        from graphgallery.gallery.nodeclas.pyg import SGC
+        trainer = SGC(device='cpu', seed=42)
+        trainer.setup_graph(toy_graph)
+        trainer.build()
+        trainer.predict(np.arange(10, 20))
+        trainer.fit(np.arange(10), epochs=2, verbose=0)
+    finally:
+        gg.set_backend(backend)
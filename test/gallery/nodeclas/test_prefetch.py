@@ -0,0 +1,50 @@
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, IterableDataset
+
+from graphgallery.gallery.nodeclas.pytorch import GCN
+
+
+class Batches(IterableDataset):
+    """Full-graph inputs with a subset of nodes as the outputs of each batch,
+    it has no length as the other iterable datasets."""
+
+    def __init__(self, feat, adj, label, index, num_batches):
+        self.feat = feat
+        self.adj = adj
+        self.label = torch.as_tensor(label)
+        self.index = np.array_split(index, num_batches)
+
+    def __iter__(self):
+        for index in self.index:
+            index = torch.as_tensor(index)
+            yield (self.feat, self.adj), self.label[index], index
+
+
+def build(toy_graph):
+    trainer = GCN(device='cpu', seed=42)
+    trainer.setup_graph(toy_graph)
+    trainer.build()
+    return trainer
+
+
+def test_fit_with_prefetch(toy_graph):
+    trainer = build(toy_graph)
+    cache = trainer.cache
+    train_data = DataLoader(Batches(cache.feat, cache.adj, toy_graph.label,
+                                    np.arange(10), num_batches=3), batch_size=None)
+    val_data = DataLoader(Batches(cache.feat, cache.adj, toy_graph.label,
+                                  np.arange(10, 20), num_batches=2), batch_size=None)
+
+    trainer.fit(train_data, val_data, epochs=3, verbose=0, prefetch=True)
+    history = trainer.model.history.history
+    assert len(history['loss']) == len(history['val_loss']) == 3
+    assert np.isfinite(history['loss']).all()
+    assert np.isfinite(history['val_loss']).all()
+
+
+def test_fit_with_prefetch_full_batch(toy_graph):
+    # full-batch sequences are left as they are
+    trainer = build(toy_graph)
+    trainer.fit(np.arange(10), np.arange(10, 20), epochs=2, verbose=0, prefetch=True)
+    assert len(trainer.model.history.history['val_loss']) == 2
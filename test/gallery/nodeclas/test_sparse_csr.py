@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+import torch
+
+from graphgallery.functional.tensor.ops import _CSR_SUPPORTED
+from graphgallery.gallery.nodeclas.pytorch import GCN
+
+
+def test_gcn_sparse_csr(toy_graph):
+    trainer = GCN(device='cpu', seed=42)
+    if _CSR_SUPPORTED:
+        trainer.setup_graph(toy_graph, sparse_csr=True)
+        assert trainer.cache.adj.layout == torch.sparse_csr
+    else:
+        with pytest.warns(UserWarning, match="Fallback to COO layout"):
+            trainer.setup_graph(toy_graph, sparse_csr=True)
+        assert trainer.cache.adj.is_sparse
+
+    trainer.build()
+    trainer.fit(np.arange(10), np.arange(10, 20), epochs=2, verbose=0)
+    assert np.isfinite(trainer.model.history.history['loss']).all()
@@ -0,0 +1,128 @@
+import os
+
+import pytest
+import torch
+
+from graphgallery.gallery.callbacks import ModelCheckpoint, _clone_state_dict, _state_dict_to_cpu
+
+
+def _devices():
+    if not torch.cuda.is_available():
+        return []
+    return [f"cuda:{i}" for i in range(torch.cuda.device_count())]
+
+
+def test_state_dict_to_cpu_keeps_metadata():
+    model = torch.nn.Sequential(torch.nn.Linear(4, 3), torch.nn.BatchNorm1d(3))
+    state_dict = model.state_dict()
+    cpu_state = _state_dict_to_cpu(state_dict)
+    assert type(cpu_state) is type(state_dict)
+    assert cpu_state._metadata == state_dict._metadata
+    for k, v in state_dict.items():
+        assert torch.equal(cpu_state[k], v)
+
+
+class WithExtraState(torch.nn.Linear):
+    def __init__(self):
+        super().__init__(4, 3)
+        self.extra = {'step': 1}
+
+    def get_extra_state(self):
+        return self.extra
+
+    def set_extra_state(self, state):
+        self.extra = state
+
+
+@pytest.mark.skipif(not hasattr(torch.nn.Module, 'get_extra_state'),
+                    reason="extra state requires PyTorch>=1.10")
+def test_clone_state_dict():
+    model = torch.nn.Sequential(WithExtraState(), torch.nn.BatchNorm1d(3))
+    state_dict = model.state_dict()
+    snapshot = _clone_state_dict(state_dict)
+    assert type(snapshot) is type(state_dict)
+    assert snapshot._metadata == state_dict._metadata
+    assert snapshot.keys() == state_dict.keys()
+
+    # the snapshot is not affected by later updates
+    with torch.no_grad():
+        model[0].weight.add_(1.)
+    model[0].extra['step'] = 2
+    assert not torch.equal(snapshot['0.weight'], model[0].weight)
+    assert snapshot['0._extra_state'] == {'step': 1}
+
+    model.load_state_dict(snapshot)
+    assert model[0].extra == {'step': 1}
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA is not available")
+@pytest.mark.parametrize("device", _devices())
+def test_state_dict_to_cpu_round_trip(device, tmp_path):
+    model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.BatchNorm1d(256)).to(device)
+    state_dict = model.state_dict()
+    filepath = tmp_path / 'weights.pth'
+    torch.save(_state_dict_to_cpu(state_dict), filepath)
+
+    loaded = torch.load(filepath)
+    assert loaded.keys() == state_dict.keys()
+    for k, v in state_dict.items():
+        assert loaded[k].device.type == 'cpu'
+        assert torch.equal(loaded[k], v.cpu())
+
+    other = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.BatchNorm1d(256))
+    other.load_state_dict(loaded)
+
+
+def run_checkpoint(checkpoint, model, val_losses=(3., 1., 2.), check=None):
+    """Sets the weights to `epoch` at each epoch, so the best one is 1."""
+    checkpoint.set_model(model)
+    checkpoint.on_train_begin()
+    for epoch, val_loss in enumerate(val_losses):
+        with torch.no_grad():
+            model.weight.fill_(epoch)
+        checkpoint.on_epoch_begin(epoch)
+        checkpoint.on_epoch_end(epoch, dict(val_loss=val_loss))
+        if check is not None:
+            check(epoch)
+    checkpoint.on_train_end()
+
+
+def test_model_checkpoint_deferred(tmp_path):
+    filepath = str(tmp_path / 'ckpt' / 'weights')
+    model = torch.nn.Linear(2, 1)
+    checkpoint = ModelCheckpoint(filepath, monitor='val_loss', autoload=False)
+
+    def check(epoch):
+        assert not os.path.exists(filepath + '.pth')
+
+    run_checkpoint(checkpoint, model, check=check)
+    state_dict = torch.load(filepath + '.pth')
+    assert torch.all(state_dict['weight'] == 1.)
+    # the weights are not loaded into the model
+    assert torch.all(model.weight == 2.)
+
+
+def test_model_checkpoint_autoload(tmp_path):
+    folder = tmp_path / 'ckpt'
+    model = torch.nn.Linear(2, 1)
+    checkpoint = ModelCheckpoint(str(folder / 'weights'), monitor='val_loss', autoload=True)
+    run_checkpoint(checkpoint, model)
+    assert not folder.exists()
+    assert torch.all(model.weight == 1.)
+
+
+def test_model_checkpoint_with_placeholders(tmp_path):
+    folder = tmp_path / 'ckpt'
+    model = torch.nn.Linear(2, 1)
+    checkpoint = ModelCheckpoint(str(folder / 'weights.{epoch:02d}'), monitor='val_loss', autoload=False)
+    expected = {0: ['weights.01.pth'],
+                1: ['weights.01.pth', 'weights.02.pth'],
+                2: ['weights.01.pth', 'weights.02.pth']}
+
+    def check(epoch):
+        # written at each improvement
+        assert sorted(os.listdir(folder)) == expected[epoch]
+
+    run_checkpoint(checkpoint, model, check=check)
+    assert sorted(os.listdir(folder)) == expected[2]
+    assert torch.all(torch.load(folder / 'weights.02.pth')['weight'] == 1.)
@@ -0,0 +1,23 @@
+import numpy as np
+import torch
+
+from graphgallery.gallery import Trainer
+
+
+def test_to_items():
+    logs = dict(loss=torch.tensor(0.5),
+                accuracy=torch.tensor(0.25),
+                correct=torch.tensor(3),
+                total=torch.tensor([4]),
+                stop=torch.tensor(True),
+                half=torch.tensor(0.5, dtype=torch.float16),
+                array=np.array(2.),
+                name='val')
+    items = Trainer.to_items(logs)
+    assert list(items) == list(logs)
+    assert items == dict(loss=0.5, accuracy=0.25, correct=3, total=4,
+                         stop=True, half=0.5, array=2., name='val')
+    assert type(items['loss']) is float
+    assert type(items['correct']) is int
+    assert type(items['total']) is int
+    assert type(items['stop']) is bool